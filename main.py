@@ -8,7 +8,17 @@ import shutil
 import http.server
 import socketserver
 import threading
-from typing import Dict, Any, List
+import csv
+import gzip
+import re
+import sqlite3
+import hashlib
+import tempfile
+import zipfile
+from collections import OrderedDict
+from contextlib import closing
+from urllib.parse import urlsplit, parse_qs, unquote
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 # Configure logging
@@ -33,15 +43,54 @@ GOOSE_API_PATH = os.path.join(RESOURCES_DIR, "kitchen-sink/goose_api.js")
 # Global variable to store the HTTP server instance
 http_server = None
 server_port = 8000  # Default port
+served_app_name = None  # Name of the app most recently served
+served_archive = None  # Open bundle when the app is served straight from an archive
 
-# Global variable to store app response
-app_response = None
+# Responses waiting to be fetched by the app, keyed by request_id (None when the app didn't send one).
+# Each is stored as (serialized body, whether it is gzip compressed) so it is only encoded once.
+# Past RESPONSE_MEMORY_BUDGET bytes the oldest are evicted, they stay in the journal until it fills up too.
+RESPONSE_MEMORY_BUDGET = 64 * 1024 * 1024
+RESPONSE_COMPRESS_THRESHOLD = 16 * 1024
+stored_responses = OrderedDict()
+stored_response_bytes = 0
+evicted_responses = 0
 response_lock = threading.Condition()
-response_ready = False
+# Bumped when the server stops, so requests still waiting on a stopped server give up
+# instead of taking a response meant for the next app served
+server_generation = 0
 
 # Global variable to store app errors
 app_errors = []
 
+# Local data sources that apps can query via /data/<name> instead of embedding them
+DATA_CACHE_DIR = os.path.expanduser("~/.config/goose/app-maker-cache")
+DATA_EXTENSIONS = (".csv", ".ndjson", ".json")
+DATA_DEFAULT_LIMIT = 100
+DATA_MAX_LIMIT = 1000
+data_index_locks = {}  # One lock per index path, so building one index doesn't hold up the others
+data_index_lock = threading.Lock()  # Guards data_index_locks
+
+# Durable journal of app responses and errors, so results survive server restarts
+JOURNAL_PATH = os.path.expanduser("~/.config/goose/app-maker-journal.sqlite")
+# Counted in the same stored (possibly compressed) bytes as the memory budget, and twice as large,
+# so responses evicted from memory are still in the journal
+JOURNAL_MAX_RESPONSE_BYTES = 2 * RESPONSE_MEMORY_BUDGET
+JOURNAL_MAX_ERRORS = 100
+journal_conn = None
+journal_lock = threading.Lock()
+
+# App bundles: zip archives of one or more apps (under <app-name>/) with a manifest of per-file hashes
+EXPORT_DIR = os.path.expanduser("~/.config/goose/app-maker-exports")
+# Imports are staged next to APP_DIR (same filesystem, so files can be moved into place) rather than in it
+IMPORT_STAGING_DIR = os.path.expanduser("~/.config/goose/app-maker-imports")
+BUNDLE_MANIFEST = "goose-bundle.json"
+BUNDLE_CHUNK_SIZE = 1024 * 1024
+# Already compressed formats are stored as is rather than deflated again
+BUNDLE_STORED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".zip", ".gz",
+    ".mp3", ".mp4", ".webm", ".woff", ".woff2", ".pdf"
+}
+
 instructions = """
 This extension allows creation and running of casual web apps for Goose.
 You are an expert html5/CSS/js web app author for casual "apps" for goose. Use this toolkit when running/making apps for goose.
@@ -67,7 +116,8 @@ When generating web apps:
 - Create clean, modern, and responsive designs
 - They should be beautiful and user-friendly
 - Ensure proper HTML5, CSS, and JavaScript structure
-- You can embed data in the app if it is static and non PII, and safe to do so
+- You can embed data in the app if it is small, static and non PII, and safe to do so
+- For larger static datasets, save them as .csv, .json or .ndjson files in the app directory (or its data/ folder) and load pages of them with gooseData(name, options) rather than embedding them
 - Of course the usual html5 browser apis are available to you (such as fetch, local storage, etc)
 - Use the goose_api.js when data needs to be dynamic (see below) for powerful data and api and agentic functionality
 - Open the app as it is built with the default browser to show the user, and invite feedback
@@ -92,6 +142,8 @@ Using goose_api.js for dynamic content:
   - gooseRequestTable(query, columns) - Returns tabular data (columns required)
 - For error reporting:
   - reportError(errorMessage) - Reports errors back to Goose
+- For local data files in the app directory:
+  - gooseData(name, {{filter, sort, limit, offset}}) - Returns {{columns, rows, total}} for a page of the data file
 - Example: const response = await gooseRequestList("List 5 best movies");
 - See {readme_path} for more detailed examples
     
@@ -100,8 +152,10 @@ Some of the tools available:
   app_list - find existing apps 
   app_serve - serve an app locally
   app_open - open an app in a browser (macos)
-  app_response - for sending data back to the app front end
+  app_response - for sending data back to the app front end (pass back the request_id if the app gave one)
   app_error - use this to see if there are error from the app, useful when modifying an app
+  app_response_stats - memory used by responses waiting to be fetched by apps
+  app_export / app_import - move apps between machines as a single archive (app_serve can also serve straight from one)
 """
 
 # Format the instructions with dynamic paths
@@ -114,6 +168,565 @@ instructions = instructions.format(
 mcp = FastMCP("Goose App Maker", instructions=instructions)
 
 
+def quote_identifier(name: str) -> str:
+    """Quote a column or table name for use in SQLite statements."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def coerce_data_value(value: str) -> Any:
+    """Convert a textual value that looks numeric into an int or float so it sorts numerically."""
+    if re.fullmatch(r"-?(0|[1-9]\d*)", value):
+        return int(value)
+    if re.fullmatch(r"-?\d+\.\d+([eE][-+]?\d+)?", value):
+        return float(value)
+    return value
+
+
+def normalize_data_value(value: Any) -> Any:
+    """Convert a JSON value into something SQLite can store."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def unique_columns(names: List[str]) -> List[str]:
+    """Make column names non-empty and unique, preserving their order."""
+    columns = []
+    for i, name in enumerate(names):
+        column = str(name).strip() or f"column_{i + 1}"
+        candidate = column
+        suffix = 2
+        while candidate in columns:
+            candidate = f"{column}_{suffix}"
+            suffix += 1
+        columns.append(candidate)
+    return columns
+
+
+def find_data_source(app_path: str, name: str) -> Optional[str]:
+    """
+    Find the data file for a data source name.
+    Looks for <name>.csv, <name>.ndjson or <name>.json in the app directory, then in its data/ folder.
+    """
+    if not name or name.startswith(".") or "/" in name or "\\" in name:
+        return None
+    for folder in (app_path, os.path.join(app_path, "data")):
+        for ext in DATA_EXTENSIONS:
+            candidate = os.path.join(folder, name + ext)
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+def read_data_source(source_path: str):
+    """
+    Read a CSV, JSON or NDJSON data file.
+    
+    Returns:
+        A tuple of (columns, rows) where rows is an iterable of lists in column order
+    """
+    if source_path.endswith(".csv"):
+        def csv_rows():
+            with open(source_path, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                for record in reader:
+                    yield [coerce_data_value(v) for v in record]
+
+        with open(source_path, newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        return unique_columns(header), csv_rows()
+
+    if source_path.endswith(".ndjson"):
+        # First pass collects the columns, second pass streams the rows
+        keys = []
+        with open(source_path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError(f"NDJSON line {line_number} must be an object")
+                    for key in record:
+                        if key not in keys:
+                            keys.append(key)
+
+        def ndjson_rows():
+            with open(source_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        yield [normalize_data_value(record.get(key)) for key in keys]
+
+        return unique_columns(keys), ndjson_rows()
+
+    with open(source_path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    # Same shape as table_data: {"columns": [...], "rows": [[...], ...]}
+    if isinstance(data, dict) and "columns" in data and "rows" in data:
+        if not isinstance(data["columns"], list) or not isinstance(data["rows"], list) \
+                or not all(isinstance(row, list) for row in data["rows"]):
+            raise ValueError("JSON table data must have a list of 'columns' and a list of 'rows' lists")
+        return unique_columns(data["columns"]), (
+            [normalize_data_value(v) for v in row] for row in data["rows"]
+        )
+
+    # Otherwise a list of objects
+    if not isinstance(data, list):
+        raise ValueError("JSON data must be a list of objects or have 'columns' and 'rows' keys")
+    keys = []
+    for i, record in enumerate(data):
+        if not isinstance(record, dict):
+            raise ValueError(f"JSON data must be a list of objects, item {i} is not an object")
+        for key in record:
+            if key not in keys:
+                keys.append(key)
+    return unique_columns(keys), (
+        [normalize_data_value(record.get(key)) for key in keys] for record in data
+    )
+
+
+def data_index_signature(index_path: str) -> Optional[str]:
+    """Read the signature of the data file an index was built from, or None if there is no usable index."""
+    if not os.path.exists(index_path):
+        return None
+    try:
+        with closing(sqlite3.connect(index_path)) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        return row[0] if row else None
+    except sqlite3.Error:
+        return None
+
+
+def build_data_index(app_name: str, name: str, source_path: str) -> str:
+    """
+    Build (or reuse) a SQLite sidecar for a data file with an index on every column.
+    The sidecar lives in DATA_CACHE_DIR and is rebuilt whenever the data file changes.
+    
+    Returns:
+        The path to the SQLite index
+    """
+    stat = os.stat(source_path)
+    signature = f"{source_path}:{stat.st_size}:{stat.st_mtime_ns}"
+    index_dir = os.path.join(DATA_CACHE_DIR, app_name)
+    index_path = os.path.join(index_dir, f"{name}.sqlite")
+
+    # Indexes are swapped in with os.replace, so an up to date one can be used without locking
+    if data_index_signature(index_path) == signature:
+        return index_path
+
+    with data_index_lock:
+        index_lock = data_index_locks.setdefault(index_path, threading.Lock())
+
+    with index_lock:
+        # Another thread may have built it while we waited
+        if data_index_signature(index_path) == signature:
+            return index_path
+
+        logger.info(f"Building data index for '{name}' from {source_path}")
+        os.makedirs(index_dir, exist_ok=True)
+        tmp_path = index_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        columns, rows = read_data_source(source_path)
+        if not columns:
+            raise ValueError(f"Data file {source_path} has no columns")
+
+        with closing(sqlite3.connect(tmp_path)) as conn:
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute(f"CREATE TABLE records ({', '.join(quote_identifier(c) for c in columns)})")
+            placeholders = ", ".join("?" for _ in columns)
+            width = len(columns)
+            conn.executemany(
+                f"INSERT INTO records VALUES ({placeholders})",
+                ((row + [None] * (width - len(row)))[:width] for row in rows)
+            )
+            for i, column in enumerate(columns):
+                conn.execute(f"CREATE INDEX idx_{i} ON records ({quote_identifier(column)})")
+            conn.execute("INSERT INTO meta VALUES ('signature', ?)", (signature,))
+            conn.commit()
+
+        os.replace(tmp_path, index_path)
+        return index_path
+
+
+def query_data_index(index_path: str, params: Dict[str, List[str]]) -> Dict[str, Any]:
+    """
+    Run a /data query against a SQLite sidecar.
+    
+    Args:
+        index_path: Path to the SQLite index built by build_data_index
+        params: Parsed query string. Supports filter=column:value (repeatable, all must match),
+                sort=column or sort=-column (descending), limit and offset.
+    
+    Returns:
+        A dictionary with the columns, the page of rows and the total number of matching rows
+    """
+    with closing(sqlite3.connect(index_path)) as conn:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(records)")]
+
+        where = []
+        args = []
+        for item in params.get("filter", []):
+            column, sep, value = item.partition(":")
+            if not sep or column not in columns:
+                raise ValueError(f"Invalid filter '{item}', expected column:value with one of {columns}")
+            # Match the raw text as well as its numeric form
+            where.append(f"{quote_identifier(column)} IN (?, ?)")
+            args.extend([value, coerce_data_value(value)])
+        where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+
+        order_sql = ""
+        sort = params.get("sort", [""])[0]
+        if sort:
+            column = sort[1:] if sort.startswith("-") else sort
+            if column not in columns:
+                raise ValueError(f"Invalid sort column '{column}', expected one of {columns}")
+            order_sql = f" ORDER BY {quote_identifier(column)} {'DESC' if sort.startswith('-') else 'ASC'}"
+
+        limit = min(max(int(params.get("limit", [DATA_DEFAULT_LIMIT])[0]), 0), DATA_MAX_LIMIT)
+        offset = max(int(params.get("offset", [0])[0]), 0)
+
+        total = conn.execute(f"SELECT COUNT(*) FROM records{where_sql}", args).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT * FROM records{where_sql}{order_sql} LIMIT ? OFFSET ?",
+            args + [limit, offset]
+        ).fetchall()
+
+    return {
+        "success": True,
+        "columns": columns,
+        "rows": [list(row) for row in rows],
+        "total": total,
+        "limit": limit,
+        "offset": offset
+    }
+
+
+def handle_data_request(app_name: str, app_path: str, request_path: str):
+    """
+    Answer a /data/<name>?filter=&sort=&limit=&offset= request for the served app.
+    
+    Returns:
+        A tuple of (status_code, response_dict), or None if there is no data file with that name
+        (so the request can fall through to normal static file serving)
+    """
+    url = urlsplit(request_path)
+    name = unquote(url.path[len("/data/"):])
+    source_path = find_data_source(app_path, name)
+    if source_path is None:
+        return None
+
+    try:
+        index_path = build_data_index(app_name, name, source_path)
+        return 200, query_data_index(index_path, parse_qs(url.query))
+    except ValueError as e:
+        return 400, {"success": False, "error": str(e)}
+    except Exception as e:
+        logger.error(f"Error querying data '{name}': {e}")
+        return 500, {"success": False, "error": f"Failed to query data: {str(e)}"}
+
+
+def pack_response(payload: bytes) -> Tuple[bytes, bool]:
+    """
+    Compress a serialized response body if it is large enough for that to pay off.
+    
+    Returns:
+        A tuple of (body, compressed)
+    """
+    if len(payload) > RESPONSE_COMPRESS_THRESHOLD:
+        packed = gzip.compress(payload, compresslevel=6)
+        if len(packed) < len(payload):
+            return packed, True
+    return payload, False
+
+
+def store_response(request_id: Optional[str], payload: bytes, compressed: bool) -> None:
+    """
+    Store a packed response body for the app to fetch and notify waiting threads.
+    Evicts the oldest stored responses once the total size goes over RESPONSE_MEMORY_BUDGET.
+    """
+    global stored_response_bytes, evicted_responses
+    with response_lock:
+        discard_response(request_id)
+        stored_responses[request_id] = (payload, compressed)
+        stored_response_bytes += len(payload)
+
+        # Never evict the response just stored, even if it alone is over budget
+        while stored_response_bytes > RESPONSE_MEMORY_BUDGET and len(stored_responses) > 1:
+            evicted_id, (evicted, _) = stored_responses.popitem(last=False)
+            stored_response_bytes -= len(evicted)
+            evicted_responses += 1
+            logger.warning(f"Evicted unclaimed response {evicted_id!r} ({len(evicted)} bytes) from memory")
+
+        response_lock.notify_all()
+
+
+def take_response(request_id: Optional[str]) -> Optional[Tuple[bytes, bool]]:
+    """
+    Remove and return a stored response.
+    
+    Returns:
+        A tuple of (body, compressed), or None if there is no response for the request_id
+    """
+    global stored_response_bytes
+    with response_lock:
+        entry = stored_responses.pop(request_id, None)
+        if entry is not None:
+            stored_response_bytes -= len(entry[0])
+        return entry
+
+
+def discard_response(request_id: Optional[str]) -> None:
+    """Drop a stored response, if there is one."""
+    take_response(request_id)
+
+
+def is_response_stored(request_id: Optional[str], payload: Optional[bytes] = None) -> bool:
+    """Check whether a response (optionally this exact body) is still waiting in memory."""
+    with response_lock:
+        entry = stored_responses.get(request_id)
+        return entry is not None and (payload is None or entry[0] is payload)
+
+
+def find_response(app_name: Optional[str], request_id: Optional[str]) -> Optional[Tuple[bytes, bool]]:
+    """
+    Find a response to deliver for a request, in memory first and then in the journal.
+    If there is none for the request_id, an undelivered response stored without a request_id is
+    used instead, in case the agent left the request_id out of its app_response call.
+    
+    Returns:
+        A tuple of (body, compressed), or None if there is no response yet
+    """
+    keys = [request_id] if request_id is None else [request_id, None]
+    for key in keys:
+        response = take_response(key)
+        try:
+            if response is not None:
+                journal_discard_responses(app_name, key)
+            else:
+                response = journal_claim_response(app_name, key)
+        except Exception as e:
+            logger.error(f"Error reading response journal: {e}")
+        if response is not None:
+            return response
+    return None
+
+
+def get_journal() -> sqlite3.Connection:
+    """Open the response/error journal (once per process), creating its tables if needed."""
+    global journal_conn
+    if journal_conn is None:
+        conn = sqlite3.connect(JOURNAL_PATH, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, app TEXT, request_id TEXT, "
+            "payload BLOB NOT NULL, compressed INTEGER NOT NULL DEFAULT 0, "
+            "created REAL NOT NULL, claimed INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(responses)")]
+        if "compressed" not in columns:
+            conn.execute("ALTER TABLE responses ADD COLUMN compressed INTEGER NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_request ON responses (request_id, app)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS errors ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, app TEXT, message TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        conn.commit()
+        journal_conn = conn
+    return journal_conn
+
+
+def journal_append_response(app_name: Optional[str], request_id: Optional[str],
+                            payload: bytes, compressed: bool) -> None:
+    """
+    Append a packed response body (as stored in memory) to the journal.
+    When the journal grows past JOURNAL_MAX_RESPONSE_BYTES the oldest entries are dropped,
+    delivered ones first.
+    """
+    with journal_lock:
+        conn = get_journal()
+        conn.execute(
+            "INSERT INTO responses (app, request_id, payload, compressed, created) VALUES (?, ?, ?, ?, ?)",
+            (app_name, request_id, payload, int(compressed), time.time())
+        )
+        total = conn.execute("SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM responses").fetchone()[0]
+        if total > JOURNAL_MAX_RESPONSE_BYTES:
+            entries = conn.execute(
+                "SELECT id, LENGTH(payload) FROM responses ORDER BY claimed DESC, id ASC"
+            ).fetchall()
+            for entry_id, size in entries:
+                if total <= JOURNAL_MAX_RESPONSE_BYTES:
+                    break
+                conn.execute("DELETE FROM responses WHERE id = ?", (entry_id,))
+                total -= size
+        conn.commit()
+
+
+def journal_claim_response(app_name: Optional[str], request_id: Optional[str]) -> Optional[Tuple[bytes, bool]]:
+    """
+    Fetch a journaled response body and mark it as delivered.
+    With a request_id the latest response for that request is returned, even if it was delivered
+    before (so a reloaded page can fetch it again). Without one, the latest undelivered response
+    for the app is returned.
+    
+    Returns:
+        A tuple of (body, compressed), or None if there isn't one
+    """
+    with journal_lock:
+        conn = get_journal()
+        if request_id is not None:
+            row = conn.execute(
+                "SELECT id, payload, compressed FROM responses WHERE request_id = ? AND (app = ? OR app IS NULL) "
+                "ORDER BY id DESC LIMIT 1",
+                (request_id, app_name)
+            ).fetchone()
+        else:
+            row = conn.execute(
+                "SELECT id, payload, compressed FROM responses WHERE request_id IS NULL AND app IS ? AND claimed = 0 "
+                "ORDER BY id DESC LIMIT 1",
+                (app_name,)
+            ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE responses SET claimed = 1 WHERE id = ?", (row[0],))
+        conn.commit()
+        return row[1], bool(row[2])
+
+
+def journal_discard_responses(app_name: Optional[str], request_id: Optional[str] = None) -> None:
+    """Mark all undelivered responses for the app and request_id (or without one) as delivered."""
+    with journal_lock:
+        conn = get_journal()
+        conn.execute(
+            "UPDATE responses SET claimed = 1 WHERE request_id IS ? AND app IS ? AND claimed = 0",
+            (request_id, app_name)
+        )
+        conn.commit()
+
+
+def journal_append_error(app_name: Optional[str], message: str) -> None:
+    """Append an app error to the journal, keeping only the last JOURNAL_MAX_ERRORS."""
+    with journal_lock:
+        conn = get_journal()
+        conn.execute(
+            "INSERT INTO errors (app, message, created) VALUES (?, ?, ?)",
+            (app_name, message, time.time())
+        )
+        conn.execute(
+            "DELETE FROM errors WHERE id NOT IN (SELECT id FROM errors ORDER BY id DESC LIMIT ?)",
+            (JOURNAL_MAX_ERRORS,)
+        )
+        conn.commit()
+
+
+def journal_load_errors() -> List[str]:
+    """Load the journaled app errors, oldest first."""
+    with journal_lock:
+        rows = get_journal().execute("SELECT message FROM errors ORDER BY id").fetchall()
+    return [row[0] for row in rows]
+
+
+def journal_clear_errors() -> None:
+    """Remove all journaled app errors."""
+    with journal_lock:
+        conn = get_journal()
+        conn.execute("DELETE FROM errors")
+        conn.commit()
+
+
+def replace_goose_env(content: str) -> str:
+    """Replace the $GOOSE_PORT and $GOOSE_SERVER__SECRET_KEY placeholders in a JavaScript file."""
+    goose_port = os.environ.get('GOOSE_PORT', '0')
+    secret_key = os.environ.get('GOOSE_SERVER__SECRET_KEY', '')
+    content = content.replace('$GOOSE_PORT', goose_port)
+    content = content.replace('$GOOSE_SERVER__SECRET_KEY', secret_key)
+    return content
+
+
+def is_safe_bundle_path(rel_path: str) -> bool:
+    """Check that a path from a bundle stays inside its app directory."""
+    parts = rel_path.replace("\\", "/").split("/")
+    return (
+        bool(rel_path) and not rel_path.startswith("/")
+        and not any(part in ("", ".", "..") for part in parts)
+    )
+
+
+def is_valid_bundle_app_name(app_name: str) -> bool:
+    """Check that an app name in a bundle is a single directory name inside APP_DIR."""
+    return is_safe_bundle_path(app_name) and "/" not in app_name.replace("\\", "/")
+
+
+def read_bundle_manifest(bundle: zipfile.ZipFile) -> Dict[str, Any]:
+    """Read and validate the manifest of an app bundle."""
+    try:
+        manifest = json.loads(bundle.read(BUNDLE_MANIFEST))
+    except KeyError:
+        raise ValueError(f"Not an app bundle, {BUNDLE_MANIFEST} is missing")
+    apps = manifest.get("apps")
+    if not isinstance(apps, dict):
+        raise ValueError(f"Invalid {BUNDLE_MANIFEST}, expected an 'apps' object")
+    for app_name, app_info in apps.items():
+        if not is_valid_bundle_app_name(app_name):
+            raise ValueError(f"Invalid app name in bundle: {app_name}")
+        if not isinstance(app_info, dict) or not isinstance(app_info.get("files"), dict):
+            raise ValueError(f"Invalid {BUNDLE_MANIFEST}, app '{app_name}' needs a 'files' object")
+        for rel_path, file_info in app_info["files"].items():
+            if not is_safe_bundle_path(rel_path):
+                raise ValueError(f"Invalid file path in bundle: {app_name}/{rel_path}")
+            if not isinstance(file_info, dict) or not isinstance(file_info.get("sha256"), str):
+                raise ValueError(f"Invalid {BUNDLE_MANIFEST}, file '{app_name}/{rel_path}' needs a 'sha256' string")
+    return manifest
+
+
+def file_sha256(path: str) -> str:
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(BUNDLE_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def index_bundle_app(bundle: zipfile.ZipFile, app_name: str) -> Dict[str, zipfile.ZipInfo]:
+    """
+    Build a random access index of one app's files in a bundle, from the zip central directory.
+    
+    Returns:
+        A dictionary mapping paths relative to the app to their zip entries
+    """
+    manifest = read_bundle_manifest(bundle)
+    if app_name not in manifest["apps"]:
+        raise ValueError(f"App '{app_name}' not found in bundle, it contains: {sorted(manifest['apps'])}")
+    prefix = app_name + "/"
+    return {
+        info.filename[len(prefix):]: info
+        for info in bundle.infolist()
+        if info.filename.startswith(prefix) and not info.is_dir()
+    }
+
+
+def close_served_archive() -> None:
+    """Close the bundle the app was served from, if any."""
+    global served_archive
+    if served_archive:
+        served_archive.close()
+        served_archive = None
+
+
+class AppHTTPServer(socketserver.ThreadingTCPServer):
+    """
+    HTTP server for apps. Each request gets its own thread so a page blocked in /wait_for_response
+    doesn't hold up other requests (such as a reloaded page reattaching to its pending result).
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+
 @mcp.tool()
 def app_list() -> Dict[str, Any]:
     """
@@ -181,8 +794,9 @@ def app_delete(app_name: str) -> Dict[str, Any]:
                 "error": f"App '{app_name}' not found at {app_path}"
             }
         
-        # Delete the app directory
+        # Delete the app directory and any data indexes built for it
         shutil.rmtree(app_path)
+        shutil.rmtree(os.path.join(DATA_CACHE_DIR, app_name), ignore_errors=True)
         
         return {
             "success": True,
@@ -194,6 +808,176 @@ def app_delete(app_name: str) -> Dict[str, Any]:
         return {"success": False, "error": f"Failed to delete app: {str(e)}"}
 
 
+@mcp.tool()
+def app_export(app_names: List[str], archive_path: str = None) -> Dict[str, Any]:
+    """
+    Export one or more apps to a single archive (a zip "bundle") for moving them to another machine.
+    The bundle includes a manifest with a hash of every file, so importing it again only writes changed files.
+    
+    Args:
+        app_names: Names of the applications to export
+        archive_path: Optional path of the archive to write
+                      (default: ~/.config/goose/app-maker-exports/<app-names>.zip)
+    
+    Returns:
+        A dictionary containing the result of the operation
+    """
+    try:
+        if not app_names:
+            return {"success": False, "error": "At least one app name is required"}
+        
+        for app_name in app_names:
+            if not is_valid_bundle_app_name(app_name):
+                return {"success": False, "error": f"Invalid app name: {app_name}"}
+            app_path = os.path.join(APP_DIR, app_name)
+            if not os.path.isdir(app_path):
+                return {
+                    "success": False, 
+                    "error": f"App '{app_name}' not found at {app_path}"
+                }
+        
+        if archive_path:
+            archive_path = os.path.expanduser(archive_path)
+        else:
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            archive_path = os.path.join(EXPORT_DIR, f"{'+'.join(app_names)}.zip")
+        
+        manifest = {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "apps": {}
+        }
+        
+        # Write to a temporary file so a failed export doesn't leave a partial archive behind
+        fd, tmp_path = tempfile.mkstemp(prefix=".export-", suffix=".zip", dir=os.path.dirname(archive_path) or ".")
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as bundle:
+                for app_name in app_names:
+                    app_path = Path(APP_DIR) / app_name
+                    files = {}
+                    for file_path in sorted(app_path.glob("**/*")):
+                        if not file_path.is_file():
+                            continue
+                        rel_path = file_path.relative_to(app_path).as_posix()
+                        info = zipfile.ZipInfo.from_file(file_path, f"{app_name}/{rel_path}")
+                        if file_path.suffix.lower() in BUNDLE_STORED_EXTENSIONS:
+                            info.compress_type = zipfile.ZIP_STORED
+                        else:
+                            info.compress_type = zipfile.ZIP_DEFLATED
+                        
+                        # Copy and hash in chunks so large assets aren't read into memory
+                        digest = hashlib.sha256()
+                        with open(file_path, "rb") as src, bundle.open(info, "w", force_zip64=True) as dest:
+                            while chunk := src.read(BUNDLE_CHUNK_SIZE):
+                                digest.update(chunk)
+                                dest.write(chunk)
+                        files[rel_path] = {"sha256": digest.hexdigest(), "size": info.file_size}
+                    
+                    manifest["apps"][app_name] = {"files": files}
+                
+                bundle.writestr(BUNDLE_MANIFEST, json.dumps(manifest, indent=2))
+            os.replace(tmp_path, archive_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        
+        return {
+            "success": True,
+            "archive_path": archive_path,
+            "apps": {name: len(info["files"]) for name, info in manifest["apps"].items()},
+            "message": f"Exported {len(app_names)} app(s) to {archive_path}"
+        }
+    except Exception as e:
+        logger.error(f"Error exporting apps: {e}")
+        return {"success": False, "error": f"Failed to export apps: {str(e)}"}
+
+
+@mcp.tool()
+def app_import(archive_path: str, app_names: List[str] = None, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Import apps from an archive created by app_export into the app directory.
+    Only files that are new or whose content changed are written, existing files not in the archive are kept.
+    
+    Args:
+        archive_path: Path to the archive
+        app_names: Optional names of the apps to import (default: all apps in the archive)
+        dry_run: If True, only report what would be written without changing anything
+    
+    Returns:
+        A dictionary containing, per app, the files that were written and how many were unchanged
+    """
+    try:
+        archive_path = os.path.expanduser(archive_path)
+        if not os.path.isfile(archive_path):
+            return {
+                "success": False,
+                "error": f"Archive not found at {archive_path}"
+            }
+        
+        results = {}
+        with zipfile.ZipFile(archive_path) as bundle:
+            manifest = read_bundle_manifest(bundle)
+            selected = app_names or list(manifest["apps"])
+            missing = [name for name in selected if name not in manifest["apps"]]
+            if missing:
+                return {
+                    "success": False,
+                    "error": f"App(s) {missing} not found in archive, it contains: {sorted(manifest['apps'])}"
+                }
+            
+            # Stage and verify every changed file before replacing anything, so a corrupt archive
+            # or a failed read doesn't leave an app half imported
+            staging_dir = None
+            if not dry_run:
+                os.makedirs(IMPORT_STAGING_DIR, exist_ok=True)
+                staging_dir = tempfile.mkdtemp(dir=IMPORT_STAGING_DIR)
+            try:
+                staged = []
+                for app_name in selected:
+                    app_path = os.path.join(APP_DIR, app_name)
+                    written = []
+                    unchanged = 0
+                    for rel_path, file_info in manifest["apps"][app_name]["files"].items():
+                        target = os.path.join(app_path, *rel_path.split("/"))
+                        if os.path.isfile(target) and file_sha256(target) == file_info["sha256"]:
+                            unchanged += 1
+                            continue
+                        written.append(rel_path)
+                        if dry_run:
+                            continue
+                        
+                        # Stream the entry to the staging directory, hashing it on the way
+                        staged_path = os.path.join(staging_dir, str(len(staged)))
+                        digest = hashlib.sha256()
+                        with bundle.open(f"{app_name}/{rel_path}") as src, open(staged_path, "wb") as dest:
+                            while chunk := src.read(BUNDLE_CHUNK_SIZE):
+                                digest.update(chunk)
+                                dest.write(chunk)
+                        if digest.hexdigest() != file_info["sha256"]:
+                            raise ValueError(f"Hash mismatch for {app_name}/{rel_path}, the archive may be corrupt")
+                        staged.append((staged_path, target))
+                    
+                    results[app_name] = {"written": written, "unchanged": unchanged}
+                
+                for staged_path, target in staged:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(staged_path, target)
+            finally:
+                if staging_dir:
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+        
+        return {
+            "success": True,
+            "archive_path": archive_path,
+            "dry_run": dry_run,
+            "apps": results,
+            "message": f"{'Checked' if dry_run else 'Imported'} {len(results)} app(s) from {archive_path}"
+        }
+    except Exception as e:
+        logger.error(f"Error importing apps: {e}")
+        return {"success": False, "error": f"Failed to import apps: {str(e)}"}
+
+
 @mcp.tool()
 def app_create(app_name: str, description: str = "") -> Dict[str, Any]:
     """
@@ -265,7 +1049,7 @@ def app_create(app_name: str, description: str = "") -> Dict[str, Any]:
         return {"success": False, "error": f"Failed to create app: {str(e)}"}
 
 @mcp.tool()
-def app_serve(app_name: str) -> Dict[str, Any]:
+def app_serve(app_name: str, archive_path: str = None) -> Dict[str, Any]:
     """
     Serve an existing web application on a local HTTP server.
     The server will automatically find an available port.
@@ -274,27 +1058,48 @@ def app_serve(app_name: str) -> Dict[str, Any]:
     
     Args:
         app_name: Name of the application to serve
+        archive_path: Optional path to an app bundle (from app_export) to serve the app from directly,
+                      without importing it
     
     Returns:
         A dictionary containing the result of the operation
     """
-    global http_server, server_port, app_response, response_ready
+    global http_server, server_port, served_app_name, served_archive
 
     if http_server:
         return "There is already a server running"
 
     # Reset response state
-    app_response = None
-    response_ready = False
+    discard_response(None)
     
     try:
-        # Find the app directory
-        app_path = os.path.join(APP_DIR, app_name)
-        if not os.path.exists(app_path):
-            return {
-                "success": False, 
-                "error": f"App '{app_name}' not found at {app_path}"
-            }
+        archive_index = None
+        bundle = None
+        if archive_path:
+            # Serve files straight out of the bundle, looked up through its central directory
+            archive_path = os.path.expanduser(archive_path)
+            if not os.path.isfile(archive_path):
+                return {
+                    "success": False,
+                    "error": f"Archive not found at {archive_path}"
+                }
+            bundle = zipfile.ZipFile(archive_path)
+            try:
+                archive_index = index_bundle_app(bundle, app_name)
+            except ValueError as e:
+                bundle.close()
+                return {"success": False, "error": str(e)}
+            served_archive = bundle
+            # Nothing is served from disk (so data files are only available for imported apps)
+            app_path = None
+        else:
+            # Find the app directory
+            app_path = os.path.join(APP_DIR, app_name)
+            if not os.path.exists(app_path):
+                return {
+                    "success": False, 
+                    "error": f"App '{app_name}' not found at {app_path}"
+                }
         
         # Stop any existing server
         if http_server:
@@ -313,12 +1118,16 @@ def app_serve(app_name: str) -> Dict[str, Any]:
         # Try the default port first, if busy find a free one
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
                 s.bind(('', server_port))
         except OSError:
             logger.info(f"Default port {server_port} is busy, finding a free port")
             server_port = find_free_port()
             logger.info(f"Found free port: {server_port}")
         
+        # Requests handled by this server stop waiting for responses once it is stopped
+        generation = server_generation
+        
         # Create a custom handler that serves from the app directory
         # and replaces environment variables in JavaScript files
         class EnvAwareHandler(http.server.SimpleHTTPRequestHandler):
@@ -332,16 +1141,85 @@ def app_serve(app_name: str) -> Dict[str, Any]:
                 self.send_header('Expires', '0')
                 super().end_headers()
             
+            def send_stored_response(self, payload, compressed):
+                # Stored responses are already serialized, just send the bytes
+                if compressed and 'gzip' not in self.headers.get('Accept-Encoding', ''):
+                    payload = gzip.decompress(payload)
+                    compressed = False
+                self.send_response(200)
+                self.send_header('Content-type', 'application/json')
+                if compressed:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def archive_has_data_source(self):
+                # Same lookup as find_data_source, against the archive's entries
+                name = unquote(urlsplit(self.path).path[len('/data/'):])
+                if not name or name.startswith('.') or '/' in name or '\\' in name:
+                    return False
+                return any(
+                    f"{folder}{name}{ext}" in archive_index
+                    for folder in ('', 'data/') for ext in DATA_EXTENSIONS
+                )
+            
+            def send_archive_file(self, head_only=False):
+                url = urlsplit(self.path)
+                rel_path = unquote(url.path).lstrip('/')
+                if rel_path and not rel_path.endswith('/') and rel_path + '/index.html' in archive_index:
+                    # Redirect to the directory, as the on-disk handler does, so relative links resolve
+                    location = url.path + '/' + (f"?{url.query}" if url.query else '')
+                    self.send_response(301)
+                    self.send_header('Location', location)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                if rel_path == '' or rel_path.endswith('/'):
+                    rel_path += 'index.html'
+                info = archive_index.get(rel_path)
+                if info is None:
+                    self.send_error(404, "File not found")
+                    return
+                
+                if rel_path.endswith('.js'):
+                    content = replace_goose_env(bundle.read(info).decode('utf-8')).encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-type', 'application/javascript')
+                    self.send_header('Content-Length', str(len(content)))
+                    self.end_headers()
+                    if not head_only:
+                        self.wfile.write(content)
+                    return
+                
+                # Stream the entry so large assets aren't read into memory
+                self.send_response(200)
+                self.send_header('Content-type', self.guess_type(rel_path))
+                self.send_header('Content-Length', str(info.file_size))
+                self.end_headers()
+                if not head_only:
+                    with bundle.open(info) as f:
+                        shutil.copyfileobj(f, self.wfile, BUNDLE_CHUNK_SIZE)
+            
+            def do_HEAD(self):
+                if archive_index is not None:
+                    self.send_archive_file(head_only=True)
+                    return
+                return super().do_HEAD()
+            
             def do_GET(self):
                 # Check if this is a wait_for_response request
                 if self.path.startswith('/wait_for_response'):
-                    global app_response, response_lock, response_ready
+                    url = urlsplit(self.path)
+                    request_id = parse_qs(url.query).get('request_id', [None])[0]
                     
                     # Reset response state for a new request
-                    if self.path.startswith('/wait_for_response/reset'):
-                        with response_lock:
-                            app_response = None
-                            response_ready = False
+                    if url.path == '/wait_for_response/reset':
+                        discard_response(None)
+                        try:
+                            journal_discard_responses(app_name)
+                        except Exception as e:
+                            logger.error(f"Error updating response journal: {e}")
                         self.send_response(200)
                         self.send_header('Content-type', 'application/json')
                         self.end_headers()
@@ -349,46 +1227,69 @@ def app_serve(app_name: str) -> Dict[str, Any]:
                         self.wfile.write(response_data.encode('utf-8'))
                         return
                     
-                    # Check if response already exists
-                    if app_response is not None and response_ready:
-                        # Return the response immediately
-                        self.send_response(200)
+                    # Wait for up to 180 seconds for the response to be ready. Responses no longer in
+                    # memory (evicted, or stored before a restart) are fetched from the journal, so a
+                    # page can reattach to its result after a reload or a server restart
+                    start_time = time.time()
+                    response = None
+                    while server_generation == generation:
+                        response = find_response(app_name, request_id)
+                        if response is not None or time.time() - start_time >= 180:
+                            break
+                        with response_lock:
+                            # Re-check memory under the lock so a response stored since isn't missed
+                            if server_generation != generation:
+                                break
+                            if is_response_stored(request_id) or is_response_stored(None):
+                                continue
+                            response_lock.wait(180 - (time.time() - start_time))
+                    
+                    if response is not None:
+                        self.send_stored_response(*response)
+                    elif server_generation != generation:
+                        # The server was stopped while this request was waiting
+                        self.send_response(503)  # Service Unavailable
                         self.send_header('Content-type', 'application/json')
                         self.end_headers()
-                        response_data = json.dumps({"success": True, "data": app_response})
+                        response_data = json.dumps({"success": False, "error": "App server stopped"})
                         self.wfile.write(response_data.encode('utf-8'))
-                        
-                        # Reset the response state after sending it
-                        with response_lock:
-                            app_response = None
-                            response_ready = False
+                    else:
+                        # Timeout occurred
+                        self.send_response(408)  # Request Timeout
+                        self.send_header('Content-type', 'application/json')
+                        self.end_headers()
+                        response_data = json.dumps({"success": False, "error": "Timeout waiting for response"})
+                        self.wfile.write(response_data.encode('utf-8'))
+                    return
+                
+                # Check if this is a query against a data file in the app directory
+                if self.path.startswith('/data/'):
+                    if archive_index is not None:
+                        if not self.archive_has_data_source():
+                            # Not a data query, serve it as a normal file from the archive
+                            self.send_archive_file()
+                            return
+                        # Data files need to be on disk to be indexed
+                        result = 400, {
+                            "success": False,
+                            "error": "Data queries are not available for apps served from an archive, "
+                                     "import the app with app_import to use them"
+                        }
+                    else:
+                        result = handle_data_request(app_name, app_path, self.path)
+                    if result is not None:
+                        status, body = result
+                        response_data = json.dumps(body).encode('utf-8')
+                        self.send_response(status)
+                        self.send_header('Content-type', 'application/json')
+                        self.send_header('Content-Length', str(len(response_data)))
+                        self.end_headers()
+                        self.wfile.write(response_data)
                         return
-                    
-                    # Wait for the response with timeout
-                    with response_lock:
-                        # Wait for up to 180 seconds for the response to be ready
-                        start_time = time.time()
-                        while not response_ready and time.time() - start_time < 180:
-                            response_lock.wait(180 - (time.time() - start_time))
-                            
-                            # Check if the response is now available
-                            if response_ready and app_response is not None:
-                                break
-                        
-                        # Check if we got the response or timed out
-                        if response_ready and app_response is not None:
-                            self.send_response(200)
-                            self.send_header('Content-type', 'application/json')
-                            self.end_headers()
-                            response_data = json.dumps({"success": True, "data": app_response})
-                            self.wfile.write(response_data.encode('utf-8'))
-                        else:
-                            # Timeout occurred
-                            self.send_response(408)  # Request Timeout
-                            self.send_header('Content-type', 'application/json')
-                            self.end_headers()
-                            response_data = json.dumps({"success": False, "error": "Timeout waiting for response"})
-                            self.wfile.write(response_data.encode('utf-8'))
+                
+                # Serve straight from the bundle when the app is served from an archive
+                if archive_index is not None:
+                    self.send_archive_file()
                     return
                 
                 # Get the file path
@@ -405,19 +1306,14 @@ def app_serve(app_name: str) -> Dict[str, Any]:
                             # Check if the file contains environment variables that need to be replaced
                             if '$GOOSE_PORT' in content or '$GOOSE_SERVER__SECRET_KEY' in content:
                                 # Replace environment variables
-                                goose_port = os.environ.get('GOOSE_PORT', '0')
-                                secret_key = os.environ.get('GOOSE_SERVER__SECRET_KEY', '')
-                                
-                                # Replace variables
-                                content = content.replace('$GOOSE_PORT', goose_port)
-                                content = content.replace('$GOOSE_SERVER__SECRET_KEY', secret_key)
+                                content = replace_goose_env(content).encode('utf-8')
                                 
                                 # Send the modified content
                                 self.send_response(200)
                                 self.send_header('Content-type', 'application/javascript')
                                 self.send_header('Content-Length', str(len(content)))
                                 self.end_headers()
-                                self.wfile.write(content.encode('utf-8'))
+                                self.wfile.write(content)
                                 return
                         except Exception as e:
                             logger.error(f"Error processing JavaScript file: {e}")
@@ -435,7 +1331,7 @@ def app_serve(app_name: str) -> Dict[str, Any]:
         def run_server():
             global http_server
             try:
-                with socketserver.TCPServer(("", server_port), EnvAwareHandler) as server:
+                with AppHTTPServer(("", server_port), EnvAwareHandler) as server:
                     http_server = server
                     # Signal that server is ready
                     server_ready.set()
@@ -448,12 +1344,14 @@ def app_serve(app_name: str) -> Dict[str, Any]:
                 server_ready.set()  # Signal even on error
                 logger.error(f"Server error: {e}")
         
+        served_app_name = app_name
         server_thread = threading.Thread(target=run_server)
         server_thread.daemon = True
         server_thread.start()
         
         # Wait for the server to start or fail, with timeout
         if not server_ready.wait(timeout=2.0):
+            close_served_archive()
             return {
                 "success": False,
                 "error": "Server failed to start within timeout period"
@@ -461,6 +1359,7 @@ def app_serve(app_name: str) -> Dict[str, Any]:
            
         # Check if there was an error
         if server_error[0]:
+            close_served_archive()
             return {
                 "success": False,
                 "error": f"Failed to serve app: {server_error[0]}"
@@ -475,6 +1374,7 @@ def app_serve(app_name: str) -> Dict[str, Any]:
         }
     except Exception as e:
         logger.error(f"Error serving app: {e}")
+        close_served_archive()
         return {"success": False, "error": f"Failed to serve app: {str(e)}"}
 
 @mcp.tool()
@@ -485,7 +1385,7 @@ def app_stop_server() -> Dict[str, Any]:
     Returns:
         A dictionary containing the result of the operation
     """
-    global http_server, app_response, response_ready
+    global http_server, server_generation
     
     try:
         if http_server:
@@ -494,9 +1394,16 @@ def app_stop_server() -> Dict[str, Any]:
             http_server.server_close()
             http_server = None
             
+            # Release requests still waiting on this server
+            with response_lock:
+                server_generation += 1
+                response_lock.notify_all()
+            
+            # Close the bundle if the app was served from an archive
+            close_served_archive()
+            
             # Reset response state
-            app_response = None
-            response_ready = False
+            discard_response(None)
             
             return {
                 "success": True,
@@ -512,7 +1419,7 @@ def app_stop_server() -> Dict[str, Any]:
         return {"success": False, "error": f"Failed to stop server: {str(e)}"}
 
 @mcp.tool()
-def app_open(app_name: str) -> Dict[str, Any]:
+def app_open(app_name: str, archive_path: str = None) -> Dict[str, Any]:
     """
     Open an app in the default web browser. If the app is not currently being served,
     it will be served first.
@@ -520,6 +1427,7 @@ def app_open(app_name: str) -> Dict[str, Any]:
     
     Args:
         app_name: Name of the application to open
+        archive_path: Optional path to an app bundle to serve the app from, if it isn't being served yet
     
     Returns:
         A dictionary containing the result of the operation
@@ -527,9 +1435,9 @@ def app_open(app_name: str) -> Dict[str, Any]:
     global http_server
     
     try:
-        # Find the app directory
+        # Find the app directory (a running server may be serving it from an archive instead)
         app_path = os.path.join(APP_DIR, app_name)
-        if not os.path.exists(app_path):
+        if not http_server and not archive_path and not os.path.exists(app_path):
             return {
                 "success": False, 
                 "error": f"App '{app_name}' not found at {app_path}"
@@ -537,7 +1445,7 @@ def app_open(app_name: str) -> Dict[str, Any]:
         
         # If the server is not running, start it
         if not http_server:
-            serve_result = app_serve(app_name)
+            serve_result = app_serve(app_name, archive_path=archive_path)
             if not serve_result["success"]:
                 return serve_result
             # Get the URL from the serve result
@@ -615,22 +1523,25 @@ def app_refresh() -> Dict[str, Any]:
 @mcp.tool()
 def app_response(string_data: str = None, 
                 list_data: List[str] = None, 
-                table_data: Dict[str, List] = None) -> bool:
+                table_data: Dict[str, List] = None,
+                request_id: str = None) -> bool:
     """
     Use this to return a response to the app that has been requested.
     Provide only one of string_data, list_data, or table_data.
+    If the app's message includes a request_id, pass it back as request_id
+    (without it the response still reaches the app, but can't be matched to its request after a reload).
     
     Args:
         string_data: Optional string response
         list_data: Optional list of strings response
         table_data: Optional table response with columns and rows
                     Format: {"columns": ["col1", "col2", ...], "rows": [["row1col1", "row1col2", ...], ...]}
+        request_id: Optional id of the app request this responds to. Responses are journaled to disk,
+                    so the app can still fetch the result after a reload or a server restart.
     
     Returns:
         True if the response was stored successfully, False otherwise
     """
-    global app_response, response_lock, response_ready
-    
     try:
         # Check that exactly one data type is provided
         provided_data = [d for d in [string_data, list_data, table_data] if d is not None]
@@ -650,19 +1561,48 @@ def app_response(string_data: str = None,
                 return False
             data = table_data
         
-        # Store the response and notify waiting threads
-        with response_lock:
-            global app_response  # Declare global inside the function block
-            app_response = data
-            global response_ready  # Declare global inside the function block
-            response_ready = True
-            response_lock.notify_all()
+        # Serialize and pack the response body once, it is delivered (and replayed from the journal) as is
+        payload, compressed = pack_response(json.dumps({"success": True, "data": data}).encode('utf-8'))
+        
+        # Store it for waiting threads first, then journal it without holding response_lock
+        app_name = served_app_name
+        store_response(request_id, payload, compressed)
+        try:
+            journal_append_response(app_name, request_id, payload, compressed)
+            # If a waiting page took the response while it was being journaled, mark it delivered
+            if not is_response_stored(request_id, payload):
+                journal_discard_responses(app_name, request_id)
+        except Exception as e:
+            logger.error(f"Error writing response journal: {e}")
         
         return True
     except Exception as e:
         logger.error(f"Error storing response: {e}")
         return False
 
+@mcp.tool()
+def app_response_stats() -> Dict[str, Any]:
+    """
+    Report the memory used by responses that are waiting to be fetched by apps.
+    Useful for sizing the server when many apps are making requests.
+    Sizes are of the stored bodies, which are gzip compressed when large. Responses evicted to stay
+    within the budget can still be fetched from the journal, which holds twice the budget.
+    
+    Returns:
+        A dictionary with the number of stored responses, their total size in bytes,
+        the memory budget, the journal limit and how many responses have been evicted
+    """
+    with response_lock:
+        return {
+            "success": True,
+            "stored_responses": len(stored_responses),
+            "stored_bytes": stored_response_bytes,
+            "compressed_responses": sum(1 for _, compressed in stored_responses.values() if compressed),
+            "budget_bytes": RESPONSE_MEMORY_BUDGET,
+            "journal_limit_bytes": JOURNAL_MAX_RESPONSE_BYTES,
+            "evicted_responses": evicted_responses
+        }
+
 @mcp.tool()
 def app_error(error_message: str = None, clear = False) -> str:
     """
@@ -692,15 +1632,27 @@ def app_error(error_message: str = None, clear = False) -> str:
 
             if clear:
                 app_errors.clear()
+                try:
+                    journal_clear_errors()
+                except Exception as e:
+                    logger.error(f"Error clearing error journal: {e}")
 
             return f"Reported errors:\n{error_list}"
         
         if clear:
             app_errors.clear()
+            try:
+                journal_clear_errors()
+            except Exception as e:
+                logger.error(f"Error clearing error journal: {e}")
 
         # Add the error to the list with a timestamp
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         app_errors.append(f"[{timestamp}] {error_message}")
+        try:
+            journal_append_error(served_app_name, f"[{timestamp}] {error_message}")
+        except Exception as e:
+            logger.error(f"Error writing error journal: {e}")
         
         # Keep only the last 100 errors to prevent unbounded growth
         if len(app_errors) > 100:
@@ -724,6 +1676,12 @@ def main():
         print("No command line arguments are supported")
     else:
         # Normal MCP server mode
+        # Restore errors reported before a restart
+        try:
+            app_errors.extend(journal_load_errors())
+        except Exception as e:
+            logger.error(f"Error loading error journal: {e}")
+
         logger.info("Starting MCP server...")
         mcp.run()
 
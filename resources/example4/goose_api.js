@@ -13,6 +13,8 @@
  *    - gooseRequestList("Give me a list of 5 book recommendations")
  *    - gooseRequestTable("Show me sales data by region", ["Region", "Revenue", "Growth"])
  *    - reportError("An error occurred: Unable to load data")
+ *    - gooseData("sales", { filter: { region: "EMEA" }, sort: "-revenue", limit: 50 })
+ *    - gooseResumePending() - fetch the result of a request that was in flight when the page was reloaded
  * 
  * 3. Each function returns a Promise that resolves with the response data.
  * 
@@ -37,6 +39,12 @@ function generateSessionId() {
 
 const gooseAppSession = generateSessionId();
 
+// Key used to remember the in-flight request across page reloads
+const GOOSE_PENDING_KEY = 'gooseAppPendingRequest';
+
+// How long to keep waiting for a response (across retries and server restarts)
+const GOOSE_WAIT_LIMIT_MS = 15 * 60 * 1000;
+
 
 /**
  * Send a request to Goose and wait for the response
@@ -44,7 +52,7 @@ const gooseAppSession = generateSessionId();
  * @returns {Promise} A promise that resolves when the response is received
  */
 async function sendGooseRequestAndWait(message) {
-  // Reset any previous response state
+  // Reset any previous response state, so a stale response sent without a request_id isn't picked up
   try {
     await fetch('/wait_for_response/reset');
     console.log('Response state reset');
@@ -52,6 +60,11 @@ async function sendGooseRequestAndWait(message) {
     console.warn('Failed to reset response state:', error);
     // Continue anyway
   }
+  
+  // Tag the request so the response can be fetched again after a reload or server restart
+  // (if the agent leaves the request_id out, the server falls back to the untagged response)
+  const requestId = generateSessionId() + Date.now().toString(36);
+  message += `\n Pass request_id="${requestId}" to the app_response tool.`;
       
   // Create the request body
   const requestBody = {
@@ -91,9 +104,10 @@ async function sendGooseRequestAndWait(message) {
     }
     
     console.log('Request sent successfully, waiting for response');
+    sessionStorage.setItem(GOOSE_PENDING_KEY, JSON.stringify({ requestId, message }));
     
     // Wait for the response to be available
-    const waitResponse = await waitForResponse();
+    const waitResponse = await waitForResponse(requestId);
     return waitResponse;
     
   } catch (error) {
@@ -104,26 +118,55 @@ async function sendGooseRequestAndWait(message) {
 
 /**
  * Wait for a response
+ * Keeps waiting through timeouts and server restarts (up to GOOSE_WAIT_LIMIT_MS),
+ * since the response is journaled by the server until it is fetched.
+ * @param {string} requestId - The id of the request to wait for
  * @returns {Promise} A promise that resolves with the response data
  */
-async function waitForResponse() {
-  console.log('Waiting for response');
+async function waitForResponse(requestId) {
+  console.log('Waiting for response', requestId);
+  const deadline = Date.now() + GOOSE_WAIT_LIMIT_MS;
   
   try {
-    // Poll the wait_for_response endpoint
-    const response = await fetch(`/wait_for_response`);
-    
-    if (!response.ok) {
-      throw new Error(`HTTP error! Status: ${response.status}`);
-    }
-    
-    const result = await response.json();
-    
-    if (result.success) {
-      console.log('Response received:', result.data);
-      return result.data;
-    } else {
-      throw new Error(result.error || 'Unknown error waiting for response');
+    while (true) {
+      let response;
+      try {
+        // Poll the wait_for_response endpoint
+        response = await fetch(`/wait_for_response?request_id=${encodeURIComponent(requestId)}`);
+      } catch (error) {
+        // The app server may be restarting, try again shortly
+        if (Date.now() > deadline) {
+          throw error;
+        }
+        console.warn('App server unavailable, retrying:', error);
+        await new Promise(resolve => setTimeout(resolve, 2000));
+        continue;
+      }
+      
+      // The server gave up waiting, but the response may still arrive
+      if (response.status === 408 && Date.now() < deadline) {
+        continue;
+      }
+      
+      // The app server was stopped, wait for it to be served again
+      if (response.status === 503 && Date.now() < deadline) {
+        await new Promise(resolve => setTimeout(resolve, 2000));
+        continue;
+      }
+      
+      if (!response.ok) {
+        throw new Error(`HTTP error! Status: ${response.status}`);
+      }
+      
+      const result = await response.json();
+      
+      if (result.success) {
+        console.log('Response received:', result.data);
+        sessionStorage.removeItem(GOOSE_PENDING_KEY);
+        return result.data;
+      } else {
+        throw new Error(result.error || 'Unknown error waiting for response');
+      }
     }
   } catch (error) {
     console.error('Error waiting for response:', error);
@@ -131,6 +174,23 @@ async function waitForResponse() {
   }
 }
 
+/**
+ * Fetch the response to a request that was still in flight when the page was reloaded,
+ * instead of sending the request to Goose again.
+ * @returns {Promise<Object|null>} A promise that resolves with { message, data },
+ *   or null if there was no request in flight
+ */
+async function gooseResumePending() {
+  const pending = sessionStorage.getItem(GOOSE_PENDING_KEY);
+  if (!pending) {
+    return null;
+  }
+  
+  const { requestId, message } = JSON.parse(pending);
+  const data = await waitForResponse(requestId);
+  return { message, data };
+}
+
 /**
  * Request a text response from Goose
  * @param {string} query - The query to send to Goose
@@ -173,6 +233,41 @@ async function gooseRequestTable(query, columns) {
   return sendGooseRequestAndWait(message);
 }
 
+/**
+ * Query a data file (name.csv, name.json or name.ndjson) stored in the app directory.
+ * The server indexes the file locally and returns just the requested page of rows,
+ * so large datasets don't need to be embedded in the app or downloaded in full.
+ * @param {string} name - The data file name without its extension
+ * @param {Object} [options] - Query options
+ * @param {Object|Array<string>} [options.filter] - Exact matches, e.g. { region: "EMEA" } or ["region:EMEA"]
+ * @param {string} [options.sort] - Column to sort by, prefix with "-" for descending
+ * @param {number} [options.limit] - Maximum number of rows to return (default 100, max 1000)
+ * @param {number} [options.offset] - Number of rows to skip
+ * @returns {Promise<Object>} A promise that resolves with { columns, rows, total, limit, offset }
+ */
+async function gooseData(name, options = {}) {
+  const params = new URLSearchParams();
+  
+  const filter = options.filter || [];
+  const filters = Array.isArray(filter)
+    ? filter
+    : Object.entries(filter).map(([column, value]) => `${column}:${value}`);
+  filters.forEach(item => params.append('filter', item));
+  
+  if (options.sort) params.set('sort', options.sort);
+  if (options.limit !== undefined) params.set('limit', options.limit);
+  if (options.offset !== undefined) params.set('offset', options.offset);
+  
+  const response = await fetch(`/data/${encodeURIComponent(name)}?${params}`);
+  const result = await response.json().catch(() => ({}));
+  
+  if (!response.ok || !result.success) {
+    throw new Error(result.error || `HTTP error! Status: ${response.status}`);
+  }
+  
+  return result;
+}
+
 /**
  * Report an error to Goose
  * @param {string} errorMessage - The error message to report